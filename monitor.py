@@ -9,13 +9,19 @@
 - 暴落という瞬間を逃さない: 初回検知を最重要視する
 """
 
-import json
+import argparse
+import asyncio
+import functools
 import os
 import sys
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
-import yfinance as yf
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 # 監視対象シンボル
@@ -30,87 +36,322 @@ CRASH_THRESHOLD_MAJOR = -20.0  # NASDAQ100が52週高値比で-20%以下
 CRASH_THRESHOLD_MINOR = -15.0  # NASDAQ100が-15%以下
 VIX_THRESHOLD = 30.0           # VIX指数が30以上
 
+# 判定条件ごとのトリガー理由（閾値は固定のため読み込み時に一度だけ組み立てる）
+_MAJOR_TRIGGER = f"NASDAQ100 が 52週高値比 {CRASH_THRESHOLD_MAJOR}% を超える下落に突入しました。"
+_MINOR_TRIGGER = f"NASDAQ100 が {CRASH_THRESHOLD_MINOR}% 下落、かつ VIX指数が {VIX_THRESHOLD} を超えました。"
+
 # 52週間の営業日数（約252日）
 LOOKBACK_DAYS = 252
 
+# データ取得設定
+MAX_RETRIES = 3                # 銘柄ごとの最大試行回数
+RETRY_WAIT_SECONDS = 2         # リトライ前の待機秒数
+MAX_CONCURRENT_REQUESTS = 3    # Yahoo Financeへの同時接続数の上限
+REQUEST_TIMEOUT_SECONDS = 10   # 1リクエストあたりのタイムアウト秒数
+YAHOO_HEADERS = {'User-Agent': 'Mozilla/5.0'}
+
+# Slack通知のタイムアウト（接続, 読み込み）秒数
+SLACK_TIMEOUT = (3.0, 5.0)
+
+# Yahoo Financeチャートエンドポイント（range=1yで直近1年分の日足を1回で取得）
+CHART_URL = 'https://query1.finance.yahoo.com/v8/finance/chart/{symbol}'
+CHART_PARAMS = {'range': '1y', 'interval': '1d'}
+
 # 状態ファイルパス
 STATE_FILE = 'state.json'
 
+# 状態ファイルが無い場合の初期状態
+DEFAULT_STATE = {
+    'is_crash': False,
+    'first_detected': None
+}
+
+# 通知メッセージのテンプレート
+_INITIAL_TMPL = """【米国株式市場・暴落監視レポート】
+
+■ 市場状態
+💥 投入検討
+
+■ 初回検知トリガー
+{trigger}
+
+■ 市場データ
+NASDAQ100: {nd_cur} ({nd_dd}%)
+S&P500: {sp_cur} ({sp_dd}%)
+VIX指数: {vix}
+
+■ 補足
+価格下落と市場心理の悪化が同時に発生しています。"""
+
+_CONT_TMPL = """【米国株式市場・暴落監視レポート】
+
+■ 市場状態
+⚠️ 投入検討（継続中）
+
+NASDAQ100 {nd_dd}% / S&P500 {sp_dd}% / VIX {vix}"""
+
+_NORMAL_TMPL = """【米国株式市場・暴落監視レポート】
+
+■ 市場状態
+✅ 投入対象外（通常状態）
+
+■ 市場データ
+NASDAQ100: {nd_cur} ({nd_dd}%)
+S&P500: {sp_cur} ({sp_dd}%)
+VIX指数: {vix}
+
+■ 補足
+市場は正常範囲内で推移しています。"""
+
+# 市場データのキャッシュ設定
+CACHE_DIR = 'cache'
+CACHE_TTL_SECONDS = 3600       # キャッシュの有効期間（1時間）
+
+# デーモンモードの既定の実行間隔（1日）
+DAEMON_INTERVAL_SECONDS = 24 * 60 * 60
 
-def get_market_data() -> Dict[str, Dict[str, float]]:
+
+def _create_slack_session() -> requests.Session:
     """
-    Yahoo Financeから市場データを取得する
+    Slack通知用のHTTPセッションを作成する（接続の再利用と一時的なエラーの自動リトライ）
     
     Returns:
-        各指数の現在値、52週高値、下落率を含む辞書
+        リトライ設定済みのセッション
     """
-    result = {}
+    retry = Retry(
+        total=3,
+        read=0,  # 送信後の読み込みエラーは再送しない（Slack側で受理済みの場合に通知が重複するため）
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(['POST'])  # Webhookへの送信はPOSTのためリトライ対象に含める
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount('https://', adapter)
+    return session
+
+
+_SESSION = _create_slack_session()
+
+
+def _write_atomic(path: str, data: bytes):
+    """
+    一時ファイルに書き込んでから置き換えることで、ファイルを原子的に更新する
+    
+    Args:
+        path: 書き込み先のパス
+        data: 書き込むバイト列
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _cache_path(symbol: str, date: str) -> str:
+    """
+    (シンボル, 日付) に対応するキャッシュファイルのパスを返す
+    """
+    return os.path.join(CACHE_DIR, f"{symbol}_{date}.json")
+
+
+def load_cached_payload(symbol: str, date: str) -> Optional[bytes]:
+    """
+    有効期限内のキャッシュ済みレスポンスを読み込む
+    
+    Args:
+        symbol: ティッカーシンボル
+        date: キャッシュのキーとなる日付（YYYY-MM-DD）
+        
+    Returns:
+        レスポンス本文（キャッシュが無いか期限切れの場合はNone）
+    """
+    path = _cache_path(symbol, date)
+    try:
+        if time.time() - os.path.getmtime(path) >= CACHE_TTL_SECONDS:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def save_cached_payload(symbol: str, date: str, raw: bytes):
+    """
+    レスポンスをキャッシュに保存し、同じシンボルの古い日付のキャッシュを削除する
+    
+    Args:
+        symbol: ティッカーシンボル
+        date: キャッシュのキーとなる日付（YYYY-MM-DD）
+        raw: レスポンス本文
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = _cache_path(symbol, date)
+        _write_atomic(path, raw)
+        
+        prefix = f"{symbol}_"
+        for entry in os.listdir(CACHE_DIR):
+            stale = os.path.join(CACHE_DIR, entry)
+            if entry.startswith(prefix) and entry.endswith('.json') and stale != path:
+                os.remove(stale)
+    except OSError as e:
+        print(f"警告: {symbol} のキャッシュ保存に失敗しました: {e}", file=sys.stderr)
+
+
+def parse_chart_bars(payload: Dict) -> Tuple[List[float], List[float]]:
+    """
+    チャートAPIのレスポンスから終値と高値の系列を取り出す
     
-    # 過去1年分のデータ取得期間を計算（営業日を考慮して余裕を持たせる）
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=LOOKBACK_DAYS + 100)
+    Args:
+        payload: チャートAPIのレスポンス
+        
+    Returns:
+        (終値のリスト, 直近252本の高値のリスト)（休場日などで欠損した値は除外）
+    """
+    quote = payload['chart']['result'][0]['indicators']['quote'][0]
+    closes = [c for c in quote['close'] if c is not None]
+    # 52週の期間は直近252本の足で区切り、その中の欠損値を除外する
+    highs = [h for h in quote['high'][-LOOKBACK_DAYS:] if h is not None]
+    return closes, highs
+
+
+def summarize_bars(name: str, symbol: str, closes: List[float],
+                   highs: List[float]) -> Dict[str, float]:
+    """
+    終値と高値の系列から現在値、52週高値、下落率を算出する
     
-    for name, symbol in SYMBOLS.items():
-        max_retries = 3
-        retry_count = 0
+    Args:
+        name: 指数名（SYMBOLSのキー）
+        symbol: ティッカーシンボル
+        closes: 終値のリスト
+        highs: 直近252本の高値のリスト
         
-        while retry_count < max_retries:
+    Returns:
+        現在値、52週高値、下落率を含む辞書
+    """
+    current = round(closes[-1], 2)
+    
+    if name == 'vix':
+        # VIXは下落率を計算しない
+        print(f"✓ {symbol}: {current}")
+        return {
+            'symbol': symbol,
+            'current': current,
+            'value': current
+        }
+    
+    # 過去252営業日の高値を取得（データが不足している場合は取得可能な範囲の高値）
+    high_52w = max(highs)
+    
+    # 下落率を計算（負の値）
+    drawdown = round(((closes[-1] - high_52w) / high_52w) * 100, 2)
+    
+    print(f"✓ {symbol}: {current} ({drawdown}%)")
+    return {
+        'symbol': symbol,
+        'current': current,
+        'high_52w': round(high_52w, 2),
+        'drawdown': drawdown
+    }
+
+
+async def fetch_symbol_bars(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                            symbol: str, date: str,
+                            force: bool = False) -> Optional[Tuple[List[float], List[float]]]:
+    """
+    Yahoo Financeのチャートエンドポイントから1銘柄分の終値と高値を取得する
+    
+    Args:
+        session: 共有するHTTPセッション
+        semaphore: 同時接続数を制限するセマフォ
+        symbol: ティッカーシンボル
+        date: キャッシュのキーとなる日付（YYYY-MM-DD）
+        force: Trueの場合はキャッシュを無視して再取得する
+        
+    Returns:
+        (終値のリスト, 高値のリスト)（取得失敗時はNone）
+    """
+    if not force:
+        cached = load_cached_payload(symbol, date)
+        if cached is not None:
             try:
-                print(f"データ取得中: {symbol} (試行 {retry_count + 1}/{max_retries})")
-                
-                # yfinanceのセッションにUser-Agentを設定
-                ticker = yf.Ticker(symbol)
-                
-                # period='1y'を使用してより確実にデータを取得
-                hist = ticker.history(period='1y', interval='1d')
-                
-                if not hist.empty and len(hist) > 0:
-                    current_price = hist['Close'].iloc[-1]
-                    
-                    if name == 'vix':
-                        # VIXは下落率を計算しない
-                        result[name] = {
-                            'symbol': symbol,
-                            'current': round(current_price, 2),
-                            'value': round(current_price, 2)
-                        }
-                        print(f"✓ {symbol}: {round(current_price, 2)}")
-                    else:
-                        # 過去252営業日の高値を取得
-                        if len(hist) >= LOOKBACK_DAYS:
-                            high_52w = hist['High'].iloc[-LOOKBACK_DAYS:].max()
-                        else:
-                            # データが不足している場合は取得可能な範囲の高値
-                            high_52w = hist['High'].max()
-                        
-                        # 下落率を計算（負の値）
-                        drawdown = ((current_price - high_52w) / high_52w) * 100
-                        
-                        result[name] = {
-                            'symbol': symbol,
-                            'current': round(current_price, 2),
-                            'high_52w': round(high_52w, 2),
-                            'drawdown': round(drawdown, 2)
-                        }
-                        print(f"✓ {symbol}: {round(current_price, 2)} ({round(drawdown, 2)}%)")
-                    
-                    break  # 成功したらループを抜ける
-                else:
-                    print(f"警告: {symbol} のデータが空です (試行 {retry_count + 1})", file=sys.stderr)
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        import time
-                        time.sleep(2)  # 2秒待機してリトライ
-                    
+                print(f"キャッシュを使用: {symbol}")
+                closes, highs = parse_chart_bars(orjson.loads(cached))
+                if closes and highs:
+                    return closes, highs
             except Exception as e:
-                print(f"エラー: {symbol} のデータ取得中にエラーが発生しました (試行 {retry_count + 1}): {e}", file=sys.stderr)
-                retry_count += 1
-                if retry_count < max_retries:
-                    import time
-                    time.sleep(2)  # 2秒待機してリトライ
+                print(f"警告: {symbol} のキャッシュを読み込めませんでした: {e}", file=sys.stderr)
+    
+    url = CHART_URL.format(symbol=symbol)
+    
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            print(f"データ取得中: {symbol} (試行 {attempt}/{MAX_RETRIES})")
+            
+            async with semaphore:
+                async with session.get(url, params=CHART_PARAMS) as response:
+                    response.raise_for_status()
+                    raw = await response.read()
+            
+            closes, highs = parse_chart_bars(orjson.loads(raw))
+            if closes and highs:
+                save_cached_payload(symbol, date, raw)
+                return closes, highs
+            
+            print(f"警告: {symbol} のデータが空です (試行 {attempt})", file=sys.stderr)
+            
+        except Exception as e:
+            print(f"エラー: {symbol} のデータ取得中にエラーが発生しました (試行 {attempt}): {e}", file=sys.stderr)
+        
+        if attempt < MAX_RETRIES:
+            await asyncio.sleep(RETRY_WAIT_SECONDS)  # 待機してリトライ
+    
+    print(f"✗ {symbol}: データ取得に失敗しました（全{MAX_RETRIES}回の試行が失敗）", file=sys.stderr)
+    return None
+
+
+def _create_market_session() -> aiohttp.ClientSession:
+    """
+    Yahoo Finance用のHTTPセッションを作成する（実行中のイベントループ内で呼び出すこと）
+    
+    Returns:
+        ヘッダーとタイムアウトを設定済みのセッション
+    """
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)
+    return aiohttp.ClientSession(headers=YAHOO_HEADERS, timeout=timeout)
+
+
+async def gather_all(session: aiohttp.ClientSession, end_date: datetime,
+                     force: bool = False) -> Dict[str, Dict[str, float]]:
+    """
+    全監視対象のデータを並行して取得する
+    
+    Args:
+        session: 共有するHTTPセッション
+        end_date: 基準日時（キャッシュのキーとなる日付に使用）
+        force: Trueの場合はキャッシュを無視して再取得する
         
-        if name not in result:
-            print(f"✗ {symbol}: データ取得に失敗しました（全{max_retries}回の試行が失敗）", file=sys.stderr)
+    Returns:
+        各指数の現在値、52週高値、下落率を含む辞書
+    """
+    date = end_date.strftime('%Y-%m-%d')
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    results = await asyncio.gather(
+        *[fetch_symbol_bars(session, semaphore, symbol, date, force) for symbol in SYMBOLS.values()]
+    )
+    
+    result = {}
+    for (name, symbol), bars in zip(SYMBOLS.items(), results):
+        if bars is None:
+            continue
+        
+        try:
+            result[name] = summarize_bars(name, symbol, *bars)
+        except Exception as e:
+            print(f"エラー: {symbol} の指標計算中にエラーが発生しました: {e}", file=sys.stderr)
     
     return result
 
@@ -134,41 +375,49 @@ def check_crash_condition(data: Dict[str, Dict[str, float]]) -> Tuple[bool, Opti
     
     # 条件1: NASDAQ100が52週高値比-20%以下
     if nasdaq_drawdown <= CRASH_THRESHOLD_MAJOR:
-        trigger = f"NASDAQ100 が 52週高値比 {CRASH_THRESHOLD_MAJOR}% を超える下落に突入しました。"
-        return True, trigger
+        return True, _MAJOR_TRIGGER
     
     # 条件2: NASDAQ100が-15%以下 かつ VIXが30以上
     if nasdaq_drawdown <= CRASH_THRESHOLD_MINOR and vix_value >= VIX_THRESHOLD:
-        trigger = f"NASDAQ100 が {CRASH_THRESHOLD_MINOR}% 下落、かつ VIX指数が {VIX_THRESHOLD} を超えました。"
-        return True, trigger
+        return True, _MINOR_TRIGGER
     
     return False, None
 
 
-def load_state() -> Dict:
+def state_mtime() -> float:
+    """
+    状態ファイルの更新時刻を返す（load_stateのキャッシュキーとして使用）
+    
+    Returns:
+        更新時刻（ファイルが存在しない場合は0）
+    """
+    try:
+        return os.path.getmtime(STATE_FILE)
+    except FileNotFoundError:
+        return 0
+
+
+@functools.lru_cache(maxsize=1)
+def load_state(mtime: float) -> Dict:
     """
     前回の状態を読み込む
     
+    更新時刻が同じ間は解析結果を再利用するため、返り値は変更せずに扱うこと
+    
+    Args:
+        mtime: 状態ファイルの更新時刻（state_mtime()の値）
+        
     Returns:
         状態辞書
     """
-    if not os.path.exists(STATE_FILE):
-        return {
-            'is_crash': False,
-            'first_detected': None,
-            'last_checked': None
-        }
-    
     try:
-        with open(STATE_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(STATE_FILE, 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return dict(DEFAULT_STATE)
     except Exception as e:
         print(f"警告: 状態ファイルの読み込みに失敗しました: {e}", file=sys.stderr)
-        return {
-            'is_crash': False,
-            'first_detected': None,
-            'last_checked': None
-        }
+        return dict(DEFAULT_STATE)
 
 
 def save_state(state: Dict):
@@ -179,8 +428,8 @@ def save_state(state: Dict):
         state: 保存する状態辞書
     """
     try:
-        with open(STATE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
+        # 一括で書き込んだ一時ファイルを置き換え、書きかけの状態ファイルが残らないようにする
+        _write_atomic(STATE_FILE, orjson.dumps(state, option=orjson.OPT_INDENT_2))
     except Exception as e:
         print(f"エラー: 状態ファイルの保存に失敗しました: {e}", file=sys.stderr)
 
@@ -200,11 +449,11 @@ def send_slack_notification(message: str, webhook_url: str):
             'unfurl_media': False
         }
         
-        response = requests.post(
+        response = _SESSION.post(
             webhook_url,
             json=payload,
             headers={'Content-Type': 'application/json'},
-            timeout=10
+            timeout=SLACK_TIMEOUT
         )
         
         if response.status_code == 200:
@@ -216,38 +465,43 @@ def send_slack_notification(message: str, webhook_url: str):
         print(f"エラー: Slack通知の送信中にエラーが発生しました: {e}", file=sys.stderr)
 
 
-def format_initial_alert(data: Dict[str, Dict[str, float]], trigger: str) -> str:
+def _alert_values(data: Dict[str, Dict[str, float]]) -> Dict[str, object]:
     """
-    初回検知時の通知メッセージをフォーマットする
+    通知テンプレートに埋め込む値を一度にまとめて取り出す
     
     Args:
         data: 市場データ
-        trigger: トリガー理由
         
     Returns:
-        フォーマット済みメッセージ
+        テンプレート用の値の辞書
     """
     nasdaq = data.get('nasdaq', {})
     sp500 = data.get('sp500', {})
     vix = data.get('vix', {})
     
-    message = f"""【米国株式市場・暴落監視レポート】
+    return {
+        'nd_cur': nasdaq.get('current', 'N/A'),
+        'nd_dd': nasdaq.get('drawdown', 'N/A'),
+        'sp_cur': sp500.get('current', 'N/A'),
+        'sp_dd': sp500.get('drawdown', 'N/A'),
+        'vix': vix.get('value', 'N/A')
+    }
 
-■ 市場状態
-💥 投入検討
 
-■ 初回検知トリガー
-{trigger}
-
-■ 市場データ
-NASDAQ100: {nasdaq.get('current', 'N/A')} ({nasdaq.get('drawdown', 'N/A')}%)
-S&P500: {sp500.get('current', 'N/A')} ({sp500.get('drawdown', 'N/A')}%)
-VIX指数: {vix.get('value', 'N/A')}
-
-■ 補足
-価格下落と市場心理の悪化が同時に発生しています。"""
+def format_initial_alert(data: Dict[str, Dict[str, float]], trigger: str) -> str:
+    """
+    初回検知時の通知メッセージをフォーマットする
     
-    return message
+    Args:
+        data: 市場データ
+        trigger: トリガー理由
+        
+    Returns:
+        フォーマット済みメッセージ
+    """
+    vals = _alert_values(data)
+    vals['trigger'] = trigger
+    return _INITIAL_TMPL.format_map(vals)
 
 
 def format_continuation_alert(data: Dict[str, Dict[str, float]]) -> str:
@@ -260,18 +514,7 @@ def format_continuation_alert(data: Dict[str, Dict[str, float]]) -> str:
     Returns:
         フォーマット済みメッセージ
     """
-    nasdaq = data.get('nasdaq', {})
-    sp500 = data.get('sp500', {})
-    vix = data.get('vix', {})
-    
-    message = f"""【米国株式市場・暴落監視レポート】
-
-■ 市場状態
-⚠️ 投入検討（継続中）
-
-NASDAQ100 {nasdaq.get('drawdown', 'N/A')}% / S&P500 {sp500.get('drawdown', 'N/A')}% / VIX {vix.get('value', 'N/A')}"""
-    
-    return message
+    return _CONT_TMPL.format_map(_alert_values(data))
 
 
 def format_normal_alert(data: Dict[str, Dict[str, float]]) -> str:
@@ -284,46 +527,18 @@ def format_normal_alert(data: Dict[str, Dict[str, float]]) -> str:
     Returns:
         フォーマット済みメッセージ
     """
-    nasdaq = data.get('nasdaq', {})
-    sp500 = data.get('sp500', {})
-    vix = data.get('vix', {})
-    
-    message = f"""【米国株式市場・暴落監視レポート】
+    return _NORMAL_TMPL.format_map(_alert_values(data))
 
-■ 市場状態
-✅ 投入対象外（通常状態）
-
-■ 市場データ
-NASDAQ100: {nasdaq.get('current', 'N/A')} ({nasdaq.get('drawdown', 'N/A')}%)
-S&P500: {sp500.get('current', 'N/A')} ({sp500.get('drawdown', 'N/A')}%)
-VIX指数: {vix.get('value', 'N/A')}
 
-■ 補足
-市場は正常範囲内で推移しています。"""
-    
-    return message
-
-
-def main():
-    """
-    メイン処理
+def report_market_state(data: Dict[str, Dict[str, float]], webhook_url: str, now_iso: str):
     """
-    print(f"実行開始: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    # Slack Webhook URLを環境変数から取得
-    webhook_url = os.environ.get('SLACK_WEBHOOK_URL')
-    if not webhook_url:
-        print("エラー: SLACK_WEBHOOK_URL 環境変数が設定されていません", file=sys.stderr)
-        sys.exit(1)
-    
-    # 市場データを取得
-    print("市場データを取得中...")
-    data = get_market_data()
-    
-    if not data:
-        print("エラー: 市場データの取得に失敗しました", file=sys.stderr)
-        sys.exit(1)
+    暴落条件を判定し、Slackへの通知と状態ファイルの更新を行う
     
+    Args:
+        data: 市場データ
+        webhook_url: Slack Webhook URL
+        now_iso: 実行時刻（ISO 8601）
+    """
     # データを表示
     print("\n取得データ:")
     for name, values in data.items():
@@ -333,11 +548,9 @@ def main():
     is_crash, trigger = check_crash_condition(data)
     
     # 前回の状態を読み込む
-    prev_state = load_state()
+    prev_state = load_state(state_mtime())
     prev_is_crash = prev_state.get('is_crash', False)
     
-    current_time = datetime.now().isoformat()
-    
     # 状態判定と通知
     if is_crash:
         if not prev_is_crash:
@@ -346,13 +559,10 @@ def main():
             message = format_initial_alert(data, trigger)
             send_slack_notification(message, webhook_url)
             
-            # 状態を保存
             new_state = {
                 'is_crash': True,
-                'first_detected': current_time,
-                'last_checked': current_time
+                'first_detected': now_iso
             }
-            save_state(new_state)
             
         else:
             # 継続中
@@ -360,10 +570,10 @@ def main():
             message = format_continuation_alert(data)
             send_slack_notification(message, webhook_url)
             
-            # 状態を更新
-            new_state = prev_state.copy()
-            new_state['last_checked'] = current_time
-            save_state(new_state)
+            new_state = {
+                'is_crash': True,
+                'first_detected': prev_state.get('first_detected')
+            }
             
     else:
         # 投入対象外（通常状態でも通知を送信）
@@ -375,15 +585,129 @@ def main():
             # 暴落状態から回復
             print("   暴落状態から回復しました")
         
-        # 状態を保存
         new_state = {
             'is_crash': False,
-            'first_detected': None,
-            'last_checked': current_time
+            'first_detected': None
         }
+    
+    # 状態が変化した場合のみ保存する（不要な書き込みとコミットを避ける）
+    if new_state != prev_state:
         save_state(new_state)
+    else:
+        print("状態に変更はありません")
+
+
+async def tick(session: aiohttp.ClientSession, webhook_url: str, force: bool = False) -> bool:
+    """
+    監視処理を1回実行する
+    
+    Args:
+        session: Yahoo Finance用のHTTPセッション
+        webhook_url: Slack Webhook URL
+        force: Trueの場合はキャッシュを無視して再取得する
+        
+    Returns:
+        市場データを取得して判定まで完了した場合はTrue
+    """
+    # 実行時刻は一度だけ取得し、ログと状態ファイルで共通して使う
+    now = datetime.now()
+    now_iso = now.isoformat()
+    now_str = now.strftime('%Y-%m-%d %H:%M:%S')
+    
+    print(f"実行開始: {now_str}")
+    
+    # 市場データを取得
+    print("市場データを取得中...")
+    data = await gather_all(session, now, force)
+    
+    if not data:
+        print("エラー: 市場データの取得に失敗しました", file=sys.stderr)
+        return False
+    
+    # Slack通知は同期的なHTTP通信（リトライ待機を含む）のため、イベントループを塞がないよう別スレッドで実行する
+    await asyncio.to_thread(report_market_state, data, webhook_url, now_iso)
     
     print(f"\n実行完了: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    return True
+
+
+async def run_once(webhook_url: str, force: bool = False) -> bool:
+    """
+    監視処理を1回だけ実行する（cron / GitHub Actions 向け）
+    
+    Args:
+        webhook_url: Slack Webhook URL
+        force: Trueの場合はキャッシュを無視して再取得する
+        
+    Returns:
+        監視処理が完了した場合はTrue
+    """
+    async with _create_market_session() as session:
+        return await tick(session, webhook_url, force)
+
+
+async def run_daemon(webhook_url: str, interval: float, force: bool = False):
+    """
+    常駐して一定間隔で監視処理を繰り返す
+    
+    HTTPセッションを使い回すため、毎回の起動やTLS接続のコストがかからない
+    
+    Args:
+        webhook_url: Slack Webhook URL
+        interval: 実行間隔（秒）
+        force: Trueの場合は初回もキャッシュを無視して再取得する
+    """
+    async with _create_market_session() as session:
+        while True:
+            try:
+                await tick(session, webhook_url, force)
+            except Exception as e:
+                print(f"エラー: 監視処理中にエラーが発生しました: {e}", file=sys.stderr)
+            
+            # 2回目以降は実行間隔そのものが鮮度を決めるため、常に最新データを取得する
+            force = True
+            await asyncio.sleep(interval)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する
+    
+    Returns:
+        解析済みの引数
+    """
+    parser = argparse.ArgumentParser(description='米国株式市場暴落監視ツール')
+    parser.add_argument('--force', action='store_true',
+                        help='キャッシュを無視して市場データを再取得する')
+    parser.add_argument('--daemon', action='store_true',
+                        help='常駐して一定間隔で監視を繰り返す')
+    parser.add_argument('--interval', type=float, default=DAEMON_INTERVAL_SECONDS,
+                        help=f'デーモンモードの実行間隔（秒、既定: {DAEMON_INTERVAL_SECONDS}）')
+    return parser.parse_args()
+
+
+def main():
+    """
+    メイン処理
+    """
+    args = parse_args()
+    
+    # Slack Webhook URLを環境変数から取得
+    webhook_url = os.environ.get('SLACK_WEBHOOK_URL')
+    if not webhook_url:
+        print("エラー: SLACK_WEBHOOK_URL 環境変数が設定されていません", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.daemon:
+        print(f"デーモンモードで起動します（実行間隔: {args.interval}秒）")
+        try:
+            asyncio.run(run_daemon(webhook_url, args.interval, args.force))
+        except KeyboardInterrupt:
+            print("\nデーモンを停止しました")
+        return
+    
+    if not asyncio.run(run_once(webhook_url, args.force)):
+        sys.exit(1)
 
 
 if __name__ == '__main__':